@@ -1,7 +1,4 @@
 import os
-import json
-from web3 import Web3
-from pathlib import Path
 from dotenv import load_dotenv
 from enum import Enum
 
@@ -17,15 +14,24 @@ class ProposalState(Enum):
     Expired = 6
     Executed = 7
 
+def decode_proposal(proposal):
+    """Map a proposals() result to named fields"""
+    # proposals() decodes as [id, proposer, startBlock, endBlock, forVotes, againstVotes, abstainVotes]
+    return {
+        'id': proposal[0],
+        'proposer': proposal[1],
+        'startBlock': proposal[2],
+        'endBlock': proposal[3],
+        'forVotes': proposal[4],
+        'againstVotes': proposal[5],
+        'abstainVotes': proposal[6]
+    }
+
 class GovernorBravoContract:
-    def __init__(self, web3_provider_uri, abi_path, contract_address):
-        self.w3 = Web3(Web3.HTTPProvider(web3_provider_uri))
-        web3_provider_uri = os.getenv("INFURA_URL")
-        contract_address = os.getenv("CONTRACT_ADDRESS")
+    def __init__(self, w3, contract_abi, contract_address):
+        # Web3 instance and ABI are shared between contracts by the ContractRegistry
+        self.w3 = w3
         self.wallet_address = os.getenv("WALLET_ADDRESS")
-        
-        with open(Path(abi_path)) as f:
-            contract_abi = json.load(f)
             
         self.contract = self.w3.eth.contract(
             address=self.w3.to_checksum_address(contract_address),
@@ -45,27 +51,26 @@ class GovernorBravoContract:
         except Exception as e:
             return f"Invalid or non-existent proposal: {str(e)}"
 
+    def get_proposal_votes(self, proposal_id):
+        """Get the vote tallies of a proposal in a single call"""
+        try:
+            proposal = decode_proposal(self.contract.functions.proposals(proposal_id).call())
+            return {
+                'for': proposal['forVotes'],
+                'against': proposal['againstVotes'],
+                'abstain': proposal['abstainVotes']
+            }
+        except Exception:
+            return None
+
     def get_proposal_details(self, proposal_id):
         """Get the details of a specific proposal with error handling"""
         try:
-            proposal = self.contract.functions.proposals(proposal_id).call()
-            
-            # GovernorBravo proposal structure typically includes:
-            # [id, proposer, eta, startBlock, endBlock, forVotes, againstVotes, abstainVotes, canceled, executed]
-            proposal_dict = {
-                'id': proposal_id,
-                'proposer': proposal[1] if len(proposal) > 1 else None,
-                'startBlock': proposal[3] if len(proposal) > 3 else None,
-                'endBlock': proposal[4] if len(proposal) > 4 else None,
-                'forVotes': proposal[5] if len(proposal) > 5 else None,
-                'againstVotes': proposal[6] if len(proposal) > 6 else None,
-                'abstainVotes': proposal[7] if len(proposal) > 7 else None,
-                'canceled': proposal[8] if len(proposal) > 8 else None,
-                'executed': proposal[9] if len(proposal) > 9 else None,
-                'state': self.get_proposal_state(proposal_id)
-            }
+            proposal_dict = decode_proposal(self.contract.functions.proposals(proposal_id).call())
+            proposal_dict['id'] = proposal_id
+            proposal_dict['state'] = self.get_proposal_state(proposal_id)
             return proposal_dict
-        except Exception as e:
+        except Exception:
             return None
         
 
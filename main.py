@@ -12,6 +12,8 @@ from theoriq.extra.flask import theoriq_blueprint
 from theoriq.schemas import ExecuteRequestBody, TextItemBlock
 from theoriq.types import Currency
 from voting import VotingSystem
+from registry import ContractRegistry
+from proposal_warmer import ProposalViewWarmer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
@@ -24,8 +26,18 @@ redis_client = redis.Redis(
     password=os.getenv('REDIS_PASSWORD'),
 )
 
-# Initialize VotingSystem
-voting_system = VotingSystem(redis_client)
+# Initialize the governor contracts and VotingSystem
+contract_registry = ContractRegistry(redis_client)
+voting_system = VotingSystem(redis_client, contract_registry)
+
+# Start the proposal view warmer, the Redis lease keeps a single one active across replicas
+if os.getenv("PROPOSAL_WARMER_ENABLED", "true").lower() == "true":
+    proposal_warmer = ProposalViewWarmer(
+        redis_client,
+        voting_system,
+        poll_interval=float(os.getenv("PROPOSAL_WARMER_INTERVAL", "12")),
+    )
+    proposal_warmer.start()
 
 def create_app():
     """Create and configure the Flask application"""
@@ -106,7 +118,10 @@ def execute(context: ExecuteContext, req: ExecuteRequestBody) -> ExecuteResponse
     # Check if we're awaiting a wallet address
     if session_state == b"awaiting_wallet":
         success, message = voting_system.initialize_user(session_id, input_text)
-        if success:
+        if success and voting_system.get_dao(session_id) is None:
+            redis_client.set(f"state:{session_id}", "awaiting_dao")
+            response_text = f"{message} \n\n" + voting_system.get_dao_menu()
+        elif success:
             redis_client.set(f"state:{session_id}", "menu")
             response_text = f"{message} \n\n" + voting_system.get_menu()
         else:
@@ -117,6 +132,20 @@ def execute(context: ExecuteContext, req: ExecuteRequestBody) -> ExecuteResponse
             cost=TheoriqCost(amount=1, currency=Currency.USDC),
         )
     
+    # Check if we're awaiting a DAO choice
+    if session_state == b"awaiting_dao":
+        success, message = voting_system.select_dao(session_id, input_text.strip())
+        if success:
+            redis_client.set(f"state:{session_id}", "menu")
+            response_text = f"{message} \n\n" + voting_system.get_menu()
+        else:
+            response_text = f"{message} \n" + voting_system.get_dao_menu()
+        
+        return context.new_response(
+            blocks=[TextItemBlock(text=response_text)],
+            cost=TheoriqCost(amount=1, currency=Currency.USDC),
+        )
+    
     # Handle menu state
     if wallet_address and (session_state == b"menu" or not session_state):
         choice = input_text.strip()
@@ -129,8 +158,10 @@ def execute(context: ExecuteContext, req: ExecuteRequestBody) -> ExecuteResponse
                 cost=TheoriqCost(amount=1, currency=Currency.USDC),
             )
             
-        if choice == "1":
-            response_text = voting_system.display_proposals(session_id)
+        if choice == "1" or choice.startswith("1 "):
+            page = choice[1:].strip()
+            page = int(page) if page.isdigit() else 1
+            response_text = voting_system.display_proposals(session_id, page)
             response_text += "\n" + voting_system.get_menu()
         elif choice == "2":
             redis_client.set(f"state:{session_id}", "awaiting_proposal")
@@ -150,6 +181,13 @@ def execute(context: ExecuteContext, req: ExecuteRequestBody) -> ExecuteResponse
                 blocks=[TextItemBlock(text=response_text)],
                 cost=TheoriqCost(amount=1, currency=Currency.USDC),
             )
+        elif choice == "6" and len(contract_registry.daos) > 1:
+            redis_client.set(f"state:{session_id}", "awaiting_dao")
+            response_text = voting_system.get_dao_menu()
+            return context.new_response(
+                blocks=[TextItemBlock(text=response_text)],
+                cost=TheoriqCost(amount=1, currency=Currency.USDC),
+            )
         else:
             response_text = "Invalid choice. " + voting_system.get_menu()
             
@@ -162,9 +200,14 @@ def execute(context: ExecuteContext, req: ExecuteRequestBody) -> ExecuteResponse
     elif session_state == b"awaiting_proposal":
         try:
             proposal_id = int(input_text)
-            redis_client.set(f"state:{session_id}", "awaiting_vote")
-            redis_client.set(f"proposal:{session_id}", str(proposal_id))
-            response_text = "Enter your vote (for/against/abstain):"
+            valid, message = voting_system.validate_proposal_id(session_id, proposal_id)
+            if valid:
+                redis_client.set(f"state:{session_id}", "awaiting_vote")
+                redis_client.set(f"proposal:{session_id}", str(proposal_id))
+                response_text = "Enter your vote (for/against/abstain):"
+            else:
+                redis_client.set(f"state:{session_id}", "menu")
+                response_text = f"{message}. " + voting_system.get_menu()
         except ValueError:
             redis_client.set(f"state:{session_id}", "menu")
             response_text = "Invalid proposal ID. " + voting_system.get_menu()
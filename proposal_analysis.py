@@ -4,14 +4,13 @@ import logging
 # from openai import OpenAI
 import anthropic
 from dotenv import load_dotenv
-from web3 import Web3
-import json
+from blockchain import decode_proposal
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class ProposalAnalyzer:
-    def __init__(self):
+    def __init__(self, governor_contract):
         load_dotenv()
         
         # Initialize OpenAI client
@@ -19,19 +18,9 @@ class ProposalAnalyzer:
         # Set up Anthropic client
         self.client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
         
-        # Initialize Web3 and contract (read-only operations)
-        self.web3 = Web3(Web3.HTTPProvider(os.getenv("INFURA_URL")))
-        self.contract_address = os.getenv("CONTRACT_ADDRESS")
-        
-        # Load contract ABI
-        with open("contract/compiled/contract_abi.json", "r") as f:
-            contract_abi = json.load(f)
-        
-        # Initialize contract
-        self.contract = self.web3.eth.contract(
-            address=Web3.to_checksum_address(self.contract_address),
-            abi=contract_abi
-        )
+        # Reuse the registry's shared Web3 and contract (read-only operations)
+        self.web3 = governor_contract.w3
+        self.contract = governor_contract.contract
         
         # Fetch wallet balance
         self.wallet_balance = self.web3.eth.get_balance(self.web3.to_checksum_address(os.getenv("WALLET_ADDRESS")))
@@ -111,37 +100,36 @@ class ProposalAnalyzer:
 
         return evaluation
 
-    def analyze_proposals(self):
+    def fetch_recent_proposals(self):
+        """Fetch the latest proposals that feed the analysis"""
+        # Fetch total number of proposals
+        proposal_count = self.contract.functions.proposalCount().call()
+        latest_proposals = range(max(1, proposal_count - 10), proposal_count + 1)
+
+        all_proposals = []
+        
+        for proposal_id in latest_proposals:
+            try:
+                proposal_details = self.contract.functions.proposals(proposal_id).call()
+                state = self.contract.functions.state(proposal_id).call()
+                
+                if proposal_details:
+                    proposal_dict = decode_proposal(proposal_details)
+                    proposal_dict['state'] = state
+                    all_proposals.append(proposal_dict)
+            except Exception as e:
+                logger.error(f"Error fetching proposal {proposal_id}: {str(e)}")
+                continue
+
+        return all_proposals
+
+    def analyze_proposals(self, all_proposals=None):
         """Analyze all recent proposals and provide insights"""
         try:
             logger.info("Starting proposal analysis process.")
             
-            # Fetch total number of proposals
-            proposal_count = self.contract.functions.proposalCount().call()
-            latest_proposals = range(max(1, proposal_count - 10), proposal_count + 1)
-
-            all_proposals = []
-            
-            for proposal_id in latest_proposals:
-                try:
-                    proposal_details = self.contract.functions.proposals(proposal_id).call()
-                    state = self.contract.functions.state(proposal_id).call()
-                    
-                    if proposal_details:
-                        proposal_dict = {
-                            'id': proposal_details[0],
-                            'proposer': proposal_details[1],
-                            'startBlock': proposal_details[2],
-                            'endBlock': proposal_details[3],
-                            'forVotes': proposal_details[4],
-                            'againstVotes': proposal_details[5],
-                            'abstainVotes': proposal_details[6],
-                            'state': state
-                        }
-                        all_proposals.append(proposal_dict)
-                except Exception as e:
-                    logger.error(f"Error fetching proposal {proposal_id}: {str(e)}")
-                    continue
+            if all_proposals is None:
+                all_proposals = self.fetch_recent_proposals()
 
             if not all_proposals:
                 return "No active or recent proposals detected in the governance contract."
@@ -0,0 +1,156 @@
+#proposal_index.py
+import time
+import logging
+from typing import Iterable, List, Optional, Tuple
+from blockchain import GovernorBravoContract, ProposalState
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# States a vote can be recorded against (castVote requires Active, as does VotingSystem.submit_vote)
+VOTABLE_STATES = (ProposalState.Active,)
+
+# States a proposal never leaves, so they are never re-read from the chain
+SETTLED_STATES = (
+    ProposalState.Canceled,
+    ProposalState.Defeated,
+    ProposalState.Expired,
+    ProposalState.Executed,
+)
+
+# Seconds an index refresh is trusted to reject unknown proposal IDs (about five blocks)
+INDEX_MAX_AGE = 60
+
+class ProposalIndex:
+    """Redis index of proposals partitioned by ProposalState.
+
+    Each state owns a sorted set of proposal IDs scored by end block, and a
+    single hash maps every proposal ID to its current state so lookups at
+    input time never touch the chain. `refresh` only re-reads proposals whose
+    state can have changed since the last indexed block.
+    """
+
+    def __init__(self, redis_client, governor_contract: GovernorBravoContract, namespace: str = ""):
+        self.redis_client = redis_client
+        self.governor_contract = governor_contract
+        self.namespace = namespace
+
+    def _state_key(self, state: ProposalState) -> str:
+        return f"{self.namespace}proposals:state:{state.name}"
+
+    def _states_key(self) -> str:
+        return f"{self.namespace}proposals:index"
+
+    def _meta_key(self) -> str:
+        return f"{self.namespace}proposals:index:meta"
+
+    def _retry_key(self) -> str:
+        return f"{self.namespace}proposals:index:retry"
+
+    def _get_meta(self, field: str) -> int:
+        value = self.redis_client.hget(self._meta_key(), field)
+        return int(value) if value else 0
+
+    def refresh(self, current_block: Optional[int] = None) -> int:
+        """Bring the index up to date with the chain head, returns the indexed block"""
+        if current_block is None:
+            current_block = self.governor_contract.w3.eth.block_number
+        indexed_block = self._get_meta('block')
+        if current_block <= indexed_block:
+            self.redis_client.hset(self._meta_key(), 'refreshed_at', int(time.time()))
+            return indexed_block
+
+        indexed_count = self._get_meta('count')
+        proposal_count = self.governor_contract.get_proposal_count()
+
+        # New proposals plus those whose state may have moved since the last refresh
+        stale_ids = set(range(indexed_count + 1, proposal_count + 1))
+        # Proposals that could not be read last time
+        stale_ids.update(int(member) for member in self.redis_client.smembers(self._retry_key()))
+        stale_ids.update(self._ids_in(ProposalState.Pending))
+        stale_ids.update(self._ids_in(ProposalState.Succeeded))
+        stale_ids.update(self._ids_in(ProposalState.Queued))
+        # Active proposals only settle once their voting period has ended
+        stale_ids.update(
+            int(member) for member in self.redis_client.zrangebyscore(
+                self._state_key(ProposalState.Active), '-inf', current_block)
+        )
+
+        pipe = self.redis_client.pipeline()
+        for proposal_id in sorted(stale_ids):
+            proposal = self.governor_contract.get_proposal_details(proposal_id)
+            if not proposal or proposal['state'] not in ProposalState.__members__:
+                logger.error(f"Could not index proposal {proposal_id}, retrying on next refresh")
+                pipe.sadd(self._retry_key(), proposal_id)
+                continue
+            pipe.srem(self._retry_key(), proposal_id)
+            self._stage(pipe, proposal_id, ProposalState[proposal['state']], proposal['endBlock'] or 0)
+
+        pipe.hset(self._meta_key(), mapping={
+            'block': current_block,
+            'count': proposal_count,
+            'refreshed_at': int(time.time())
+        })
+        pipe.execute()
+
+        logger.info(f"Proposal index refreshed at block {current_block} ({len(stale_ids)} proposals re-read)")
+        return current_block
+
+    def _stage(self, pipe, proposal_id: int, state: ProposalState, end_block: int) -> None:
+        """Queue the moves placing a proposal in exactly one state partition"""
+        for other in ProposalState:
+            if other is not state:
+                pipe.zrem(self._state_key(other), proposal_id)
+        pipe.zadd(self._state_key(state), {proposal_id: end_block})
+        pipe.hset(self._states_key(), proposal_id, state.name)
+
+    def _ids_in(self, state: ProposalState) -> List[int]:
+        return [int(member) for member in self.redis_client.zrange(self._state_key(state), 0, -1)]
+
+    def get_state(self, proposal_id: int) -> Optional[ProposalState]:
+        """Indexed state of a proposal, None if the proposal is unknown"""
+        state = self.redis_client.hget(self._states_key(), proposal_id)
+        return ProposalState[state.decode('utf-8')] if state else None
+
+    def is_fresh(self) -> bool:
+        """Whether the index was refreshed within INDEX_MAX_AGE seconds"""
+        return time.time() - self._get_meta('refreshed_at') <= INDEX_MAX_AGE
+
+    def validate_proposal_id(self, proposal_id: int) -> Tuple[bool, str]:
+        """Check a proposal ID against the index without an RPC.
+
+        IDs below 1 and proposals in a settled state are always rejected.
+        IDs beyond the indexed proposal count are rejected only while the
+        index is fresh; otherwise, like any other open question, they are
+        left to the on-chain check in submit_vote.
+        """
+        if proposal_id < 1:
+            return False, f"Proposal {proposal_id} not found"
+        if proposal_id > self._get_meta('count') and self.is_fresh():
+            return False, f"Proposal {proposal_id} not found"
+
+        state = self.get_state(proposal_id)
+        if state in SETTLED_STATES:
+            return False, f"Proposal {proposal_id} is {state.name} and not open for voting"
+        return True, ""
+
+    def count(self, states: Iterable[ProposalState] = VOTABLE_STATES) -> int:
+        """Number of indexed proposals in the given states"""
+        return sum(self.redis_client.zcard(self._state_key(state)) for state in states)
+
+    def list_ids(self, states: Iterable[ProposalState] = VOTABLE_STATES,
+                 page: int = 1, page_size: int = 10) -> List[int]:
+        """Page through proposal IDs in the given states, latest end block first"""
+        states = list(states)
+        start = (max(page, 1) - 1) * page_size
+        stop = start + page_size - 1
+
+        if len(states) == 1:
+            members = self.redis_client.zrevrange(self._state_key(states[0]), start, stop)
+            return [int(member) for member in members]
+
+        scored = []
+        for state in states:
+            scored.extend(self.redis_client.zrevrange(self._state_key(state), 0, -1, withscores=True))
+        scored.sort(key=lambda item: (item[1], int(item[0])), reverse=True)
+        return [int(member) for member, _ in scored[start:stop + 1]]
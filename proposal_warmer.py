@@ -0,0 +1,163 @@
+#proposal_warmer.py
+import asyncio
+import logging
+import threading
+import uuid
+from typing import Callable, Dict, Optional
+from web3 import AsyncWeb3, WebSocketProvider
+from proposal_analysis import ProposalAnalyzer
+from registry import DAO
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Extend the lease only while this worker still holds it
+RENEW_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Drop the lease only while this worker still holds it
+RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class NewHeadsSource:
+    """Chain head tracked through an eth_subscribe('newHeads') websocket"""
+
+    def __init__(self, ws_uri: str):
+        self.ws_uri = ws_uri
+        self.head = None
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._listen()), daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with AsyncWeb3(WebSocketProvider(self.ws_uri)) as w3:
+                    await w3.eth.subscribe("newHeads")
+                    async for message in w3.socket.process_subscriptions():
+                        self.head = message['result']['number']
+            except Exception as e:
+                logger.error(f"newHeads subscription dropped: {str(e)}")
+                await asyncio.sleep(5)
+
+    def __call__(self) -> Optional[int]:
+        return self.head
+
+
+class ProposalViewWarmer:
+    """Background worker that keeps the shared proposal views in Redis fresh.
+
+    Every poll it reads each registered DAO's chain head and, on a new block,
+    asks the VotingSystem to rebuild and publish that DAO's view. Only the
+    holder of the Redis lease does any work, so one warmer runs across all
+    replicas. Heads come from a shared NewHeadsSource when the DAO has a
+    ws_uri and from eth_blockNumber otherwise; head_source, any callable
+    taking a DAO and returning a block number (e.g. a local test node), can
+    stand in for both.
+    """
+
+    def __init__(self, redis_client, voting_system,
+                 head_source: Optional[Callable[[DAO], Optional[int]]] = None,
+                 poll_interval: float = 12, lease_ttl: float = 60):
+        self.redis_client = redis_client
+        self.voting_system = voting_system
+        self.head_source = head_source or self._chain_head
+        self.poll_interval = poll_interval
+        self.lease_ttl = lease_ttl
+        self.lease_key = "proposals:view:lease"
+        self.token = str(uuid.uuid4())
+        self.last_heads: Dict[str, int] = {}
+        self.proposal_analyzers: Dict[str, ProposalAnalyzer] = {}
+        self.new_heads_sources: Dict[str, NewHeadsSource] = {}
+        self._renew_lease = redis_client.register_script(RENEW_LEASE_SCRIPT)
+        self._release_lease = redis_client.register_script(RELEASE_LEASE_SCRIPT)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def acquire_lease(self) -> bool:
+        """Take or extend the warmer lease, returns whether this worker holds it"""
+        ttl_ms = int(self.lease_ttl * 1000)
+        if self.redis_client.set(self.lease_key, self.token, nx=True, px=ttl_ms):
+            logger.info("Proposal view warmer acquired lease")
+            return True
+        return bool(self._renew_lease(keys=[self.lease_key], args=[self.token, ttl_ms]))
+
+    def release_lease(self) -> None:
+        self._release_lease(keys=[self.lease_key], args=[self.token])
+
+    def holds_lease(self) -> bool:
+        return self.redis_client.get(self.lease_key) == self.token.encode('utf-8')
+
+    def _keep_lease(self, done: threading.Event) -> None:
+        """Renew the lease until a pass is done, a cold build can outlast lease_ttl"""
+        while not done.wait(self.lease_ttl / 3):
+            if not self.acquire_lease():
+                logger.info("Proposal view warmer lost lease")
+                return
+
+    def _chain_head(self, dao: DAO) -> Optional[int]:
+        """Latest block for a DAO, one websocket subscription per endpoint"""
+        if not dao.ws_uri:
+            return dao.contract.w3.eth.block_number
+        if dao.ws_uri not in self.new_heads_sources:
+            self.new_heads_sources[dao.ws_uri] = NewHeadsSource(dao.ws_uri)
+            self.new_heads_sources[dao.ws_uri].start()
+        return self.new_heads_sources[dao.ws_uri]()
+
+    def run_once(self) -> bool:
+        """Warm the views if this worker holds the lease and new blocks arrived"""
+        if not self.acquire_lease():
+            # Another replica is warming, recompute fully if we take over later
+            self.last_heads.clear()
+            return False
+
+        # Renew in the background while the pass runs
+        done = threading.Event()
+        threading.Thread(target=self._keep_lease, args=(done,), daemon=True).start()
+        published = False
+        try:
+            for dao in self.voting_system.registry.all():
+                # Stop if the lease was lost part way through the pass
+                if not self.holds_lease():
+                    self.last_heads.clear()
+                    return published
+                try:
+                    head = self.head_source(dao)
+                    if head is None or head == self.last_heads.get(dao.dao_id):
+                        continue
+
+                    if dao.dao_id not in self.proposal_analyzers:
+                        self.proposal_analyzers[dao.dao_id] = ProposalAnalyzer(dao.contract)
+                    if self.voting_system.publish_proposal_view(dao, self.proposal_analyzers[dao.dao_id], head):
+                        published = True
+                    self.last_heads[dao.dao_id] = head
+                except Exception as e:
+                    logger.error(f"Error warming proposal view for DAO {dao.dao_id}: {str(e)}")
+        finally:
+            done.set()
+        return published
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error warming proposal view: {str(e)}")
+            self._stop.wait(self.poll_interval)
+        self.release_lease()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,125 @@
+#registry.py
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+from web3 import Web3
+from dotenv import load_dotenv
+from blockchain import GovernorBravoContract
+from proposal_index import ProposalIndex
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_ABI_PATH = "contract/compiled/contract_abi.json"
+
+class DAO:
+    """A governor contract served by the registry along with its Redis namespace"""
+
+    def __init__(self, dao_id: str, name: str, namespace: str, contract: GovernorBravoContract,
+                 index: ProposalIndex, provider_uri: str, ws_uri: Optional[str] = None,
+                 rate_limit: Optional[int] = None):
+        self.dao_id = dao_id
+        self.name = name
+        self.namespace = namespace
+        self.contract = contract
+        self.index = index
+        self.provider_uri = provider_uri
+        self.ws_uri = ws_uri
+        self.rate_limit = rate_limit
+
+    def key(self, key: str) -> str:
+        """Prefix a Redis key with this DAO's namespace"""
+        return f"{self.namespace}{key}"
+
+
+class ContractRegistry:
+    """Serves many governor contracts from one process.
+
+    DAOs are read from the JSON file at DAO_CONFIG_PATH, a list of objects with
+    id, name, contract_address and optionally provider_uri, ws_uri, abi_path and
+    rate_limit (requests per minute). Without it a single "default" DAO is built
+    from INFURA_URL and CONTRACT_ADDRESS and keeps the un-prefixed Redis keys.
+    Web3 providers and ABIs are shared between DAOs using the same endpoint or
+    ABI file.
+    """
+
+    def __init__(self, redis_client, config_path: Optional[str] = None):
+        load_dotenv()
+        self.redis_client = redis_client
+        self._providers: Dict[str, Web3] = {}
+        self._abis: Dict[str, list] = {}
+        self.daos: Dict[str, DAO] = {}
+
+        config_path = config_path or os.getenv("DAO_CONFIG_PATH")
+        if config_path:
+            with open(Path(config_path)) as f:
+                for config in json.load(f):
+                    self.register(config, namespace=f"dao:{config['id']}:")
+        else:
+            self.register({
+                'id': 'default',
+                'name': 'Default DAO',
+                'contract_address': os.getenv("CONTRACT_ADDRESS"),
+                'ws_uri': os.getenv("INFURA_WS_URL"),
+                'rate_limit': os.getenv("DAO_RATE_LIMIT")
+            }, namespace="")
+
+    def get_provider(self, provider_uri: str) -> Web3:
+        """Get the shared Web3 instance for an endpoint"""
+        if provider_uri not in self._providers:
+            self._providers[provider_uri] = Web3(Web3.HTTPProvider(provider_uri))
+        return self._providers[provider_uri]
+
+    def get_abi(self, abi_path: str) -> list:
+        """Get the shared ABI loaded from a file"""
+        if abi_path not in self._abis:
+            with open(Path(abi_path)) as f:
+                self._abis[abi_path] = json.load(f)
+        return self._abis[abi_path]
+
+    def register(self, config: Dict, namespace: str) -> DAO:
+        """Build a DAO from its config and add it to the registry"""
+        provider_uri = config.get('provider_uri') or os.getenv("INFURA_URL")
+        contract = GovernorBravoContract(
+            w3=self.get_provider(provider_uri),
+            contract_abi=self.get_abi(config.get('abi_path') or DEFAULT_ABI_PATH),
+            contract_address=config['contract_address']
+        )
+        rate_limit = config.get('rate_limit')
+        dao = DAO(
+            dao_id=config['id'],
+            name=config.get('name') or config['id'],
+            namespace=namespace,
+            contract=contract,
+            index=ProposalIndex(self.redis_client, contract, namespace=namespace),
+            provider_uri=provider_uri,
+            ws_uri=config.get('ws_uri'),
+            rate_limit=int(rate_limit) if rate_limit else None
+        )
+        self.daos[dao.dao_id] = dao
+        logger.info(f"Registered DAO {dao.dao_id} at {config['contract_address']}")
+        return dao
+
+    def get(self, dao_id: str) -> Optional[DAO]:
+        return self.daos.get(dao_id)
+
+    def all(self) -> List[DAO]:
+        return list(self.daos.values())
+
+    def default(self) -> Optional[DAO]:
+        """The DAO sessions use without choosing, only when exactly one is registered"""
+        return self.all()[0] if len(self.daos) == 1 else None
+
+    def check_rate_limit(self, dao: DAO) -> bool:
+        """Count a request against the DAO's per-minute limit, returns whether it is allowed"""
+        if not dao.rate_limit:
+            return True
+        key = dao.key(f"ratelimit:{int(time.time() // 60)}")
+        pipe = self.redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, 60)
+        count, _ = pipe.execute()
+        return count <= dao.rate_limit
@@ -0,0 +1,152 @@
+import time
+
+
+def _bytes(value):
+    return value if isinstance(value, bytes) else str(value).encode('utf-8')
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute"""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands the app uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def _expire_keys(self):
+        now = time.monotonic()
+        for key, deadline in list(self.expiry.items()):
+            if deadline <= now:
+                self.data.pop(key, None)
+                self.expiry.pop(key)
+
+    def _get(self, key, default):
+        self._expire_keys()
+        return self.data.setdefault(key, default)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def exists(self, key):
+        self._expire_keys()
+        return int(key in self.data)
+
+    def get(self, key):
+        self._expire_keys()
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        self._expire_keys()
+        if nx and key in self.data:
+            return None
+        self.data[key] = _bytes(value)
+        self.expiry.pop(key, None)
+        if px is not None:
+            self.expiry[key] = time.monotonic() + px / 1000
+        if ex is not None:
+            self.expiry[key] = time.monotonic() + ex
+        return True
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = _bytes(value)
+        return value
+
+    def expire(self, key, seconds):
+        self._expire_keys()
+        if key not in self.data:
+            return False
+        self.expiry[key] = time.monotonic() + seconds
+        return True
+
+    def hget(self, key, field):
+        self._expire_keys()
+        return self.data.get(key, {}).get(_bytes(field))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        fields = dict(mapping or {})
+        if field is not None:
+            fields[field] = value
+        hash_ = self._get(key, {})
+        for name, item in fields.items():
+            hash_[_bytes(name)] = _bytes(item)
+        return len(fields)
+
+    def hgetall(self, key):
+        self._expire_keys()
+        return dict(self.data.get(key, {}))
+
+    def smembers(self, key):
+        self._expire_keys()
+        return set(self.data.get(key, set()))
+
+    def sadd(self, key, member):
+        self._get(key, set()).add(_bytes(member))
+
+    def srem(self, key, member):
+        self._get(key, set()).discard(_bytes(member))
+
+    def zadd(self, key, mapping):
+        zset = self._get(key, {})
+        for member, score in mapping.items():
+            zset[_bytes(member)] = float(score)
+
+    def zrem(self, key, member):
+        self._get(key, {}).pop(_bytes(member), None)
+
+    def zcard(self, key):
+        self._expire_keys()
+        return len(self.data.get(key, {}))
+
+    def _sorted(self, key, reverse):
+        self._expire_keys()
+        items = sorted(self.data.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=reverse)
+        return items
+
+    def _slice(self, items, start, stop):
+        return items[start:] if stop == -1 else items[start:stop + 1]
+
+    def zrange(self, key, start, stop):
+        return [member for member, _ in self._slice(self._sorted(key, False), start, stop)]
+
+    def zrevrange(self, key, start, stop, withscores=False):
+        items = self._slice(self._sorted(key, True), start, stop)
+        return items if withscores else [member for member, _ in items]
+
+    def zrangebyscore(self, key, low, high):
+        low = float(low)
+        high = float(high)
+        return [member for member, score in self._sorted(key, False) if low <= score <= high]
+
+    def register_script(self, script):
+        # Both lease scripts act only while the caller's token holds the key
+        def run(keys, args):
+            self._expire_keys()
+            key, token = keys[0], args[0]
+            if self.data.get(key) != _bytes(token):
+                return 0
+            if 'pexpire' in script:
+                self.expiry[key] = time.monotonic() + int(args[1]) / 1000
+            else:
+                self.data.pop(key)
+                self.expiry.pop(key, None)
+            return 1
+        return run
@@ -0,0 +1,16 @@
+import json
+from pathlib import Path
+from blockchain import decode_proposal
+
+ABI_PATH = Path(__file__).resolve().parent.parent / "contract/compiled/contract_abi.json"
+
+
+def test_decode_proposal_follows_abi_field_order():
+    with open(ABI_PATH) as f:
+        abi = json.load(f)
+    proposals = next(item for item in abi if item.get('name') == 'proposals')
+    field_names = [output['name'] for output in proposals['outputs']]
+
+    decoded = decode_proposal(list(range(len(field_names))))
+    assert list(decoded) == field_names
+    assert [decoded[name] for name in field_names] == list(range(len(field_names)))
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+from blockchain import ProposalState
+from proposal_index import ProposalIndex
+from fake_redis import FakeRedis
+
+
+class StubGovernor:
+    """Governor contract stand-in whose proposals are edited by the test"""
+
+    def __init__(self):
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(block_number=100))
+        self.proposals = {}
+        self.reads = {}
+        self.failing = set()
+
+    def add(self, proposal_id, state, end_block):
+        self.proposals[proposal_id] = {'state': state.name, 'endBlock': end_block}
+
+    def mine_to(self, block):
+        self.w3.eth.block_number = block
+
+    def get_proposal_count(self):
+        return len(self.proposals)
+
+    def get_proposal_details(self, proposal_id):
+        self.reads[proposal_id] = self.reads.get(proposal_id, 0) + 1
+        if proposal_id in self.failing:
+            return None
+        return dict(self.proposals[proposal_id], id=proposal_id)
+
+
+def make_index():
+    governor = StubGovernor()
+    return ProposalIndex(FakeRedis(), governor), governor
+
+
+def test_proposal_moves_between_partitions():
+    index, governor = make_index()
+    governor.add(1, ProposalState.Pending, 120)
+    index.refresh()
+    assert index.get_state(1) is ProposalState.Pending
+    assert index.list_ids() == []
+
+    governor.add(1, ProposalState.Active, 120)
+    governor.mine_to(101)
+    index.refresh()
+    assert index.get_state(1) is ProposalState.Active
+    assert index.list_ids() == [1]
+    assert index.list_ids([ProposalState.Pending]) == []
+
+    governor.add(1, ProposalState.Defeated, 120)
+    governor.mine_to(121)
+    index.refresh()
+    assert index.get_state(1) is ProposalState.Defeated
+    assert index.list_ids() == []
+    assert index.list_ids([ProposalState.Defeated]) == [1]
+
+
+def test_active_proposal_is_reread_only_after_end_block():
+    index, governor = make_index()
+    governor.add(1, ProposalState.Active, 110)
+    index.refresh()
+    assert governor.reads[1] == 1
+
+    governor.mine_to(105)
+    index.refresh()
+    assert governor.reads[1] == 1
+
+    governor.mine_to(111)
+    index.refresh()
+    assert governor.reads[1] == 2
+
+
+def test_failed_proposal_is_retried():
+    index, governor = make_index()
+    governor.add(1, ProposalState.Active, 110)
+    governor.failing.add(1)
+    index.refresh()
+    assert index.get_state(1) is None
+
+    governor.failing.clear()
+    governor.mine_to(101)
+    index.refresh()
+    assert index.get_state(1) is ProposalState.Active
+
+    governor.mine_to(102)
+    index.refresh()
+    assert governor.reads[1] == 2
+
+
+def test_list_ids_pages_latest_end_block_first():
+    index, governor = make_index()
+    for proposal_id in range(1, 13):
+        governor.add(proposal_id, ProposalState.Active, 200 + proposal_id)
+    index.refresh()
+
+    assert index.count() == 12
+    assert index.list_ids(page=1, page_size=10) == list(range(12, 2, -1))
+    assert index.list_ids(page=2, page_size=10) == [2, 1]
+    assert index.list_ids(page=3, page_size=10) == []
+
+
+def test_validate_proposal_id():
+    index, governor = make_index()
+    governor.add(1, ProposalState.Executed, 50)
+    governor.add(2, ProposalState.Active, 150)
+    index.refresh()
+
+    assert index.validate_proposal_id(1) == (False, "Proposal 1 is Executed and not open for voting")
+    assert index.validate_proposal_id(2) == (True, "")
+    assert index.validate_proposal_id(0) == (False, "Proposal 0 not found")
+    assert index.validate_proposal_id(3) == (False, "Proposal 3 not found")
+
+    # A stale index leaves unknown IDs to the on-chain check
+    index.redis_client.hset(index._meta_key(), 'refreshed_at', 0)
+    assert index.validate_proposal_id(3) == (True, "")
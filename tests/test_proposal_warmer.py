@@ -0,0 +1,144 @@
+import time
+from proposal_warmer import ProposalViewWarmer
+from registry import DAO
+from voting import VotingSystem
+from fake_redis import FakeRedis
+
+
+class LocalChain:
+    """Local-node stand-in: one chain head and a single Active proposal"""
+
+    def __init__(self):
+        self.head = 100
+        self.for_votes = 0
+
+    def mine(self):
+        self.head += 1
+
+
+class StubIndex:
+    def __init__(self, chain):
+        self.chain = chain
+        self.refreshed_at = []
+
+    def refresh(self, current_block=None):
+        self.refreshed_at.append(current_block)
+        return self.chain.head
+
+    def count(self):
+        return 1
+
+    def list_ids(self, page_size=10):
+        return [1]
+
+
+class StubContract:
+    def __init__(self, chain):
+        self.chain = chain
+
+    def get_proposal_votes(self, proposal_id):
+        return {'for': self.chain.for_votes, 'against': 0, 'abstain': 0}
+
+
+class StubAnalyzer:
+    def __init__(self, delay=0):
+        self.analyses = 0
+        self.delay = delay
+
+    def fetch_recent_proposals(self):
+        return []
+
+    def analyze_proposals(self, all_proposals=None):
+        time.sleep(self.delay)
+        self.analyses += 1
+        return f"analysis {self.analyses}"
+
+
+class StubRegistry:
+    def __init__(self, daos):
+        self.daos = {dao.dao_id: dao for dao in daos}
+
+    def all(self):
+        return list(self.daos.values())
+
+
+def make_warmer(redis_client, chain, analyzer, lease_ttl=60):
+    dao = DAO('test', 'Test DAO', '', StubContract(chain), StubIndex(chain), 'http://localhost:8545')
+    voting_system = VotingSystem(redis_client, StubRegistry([dao]))
+    warmer = ProposalViewWarmer(redis_client, voting_system,
+                                head_source=lambda dao: chain.head, lease_ttl=lease_ttl)
+    warmer.proposal_analyzers['test'] = analyzer
+    return warmer, voting_system, dao
+
+
+def test_warmer_publishes_view_on_new_head():
+    redis_client, chain, analyzer = FakeRedis(), LocalChain(), StubAnalyzer()
+    warmer, voting_system, dao = make_warmer(redis_client, chain, analyzer)
+
+    assert warmer.run_once()
+    # The head read by the warmer is reused for the index refresh
+    assert dao.index.refreshed_at == [100]
+    view = voting_system.get_proposal_view(dao)
+    assert view['block'] == 100
+    assert view['proposal_ids'] == [1]
+    assert view['analysis'] == "analysis 1"
+
+    # Same head, nothing to do
+    assert not warmer.run_once()
+    assert analyzer.analyses == 1
+
+
+def test_warmer_skips_analysis_when_proposal_data_is_unchanged():
+    redis_client, chain, analyzer = FakeRedis(), LocalChain(), StubAnalyzer()
+    warmer, voting_system, dao = make_warmer(redis_client, chain, analyzer)
+    warmer.run_once()
+
+    chain.mine()
+    assert not warmer.run_once()
+    assert analyzer.analyses == 1
+
+    chain.mine()
+    chain.for_votes = 5
+    assert warmer.run_once()
+    assert analyzer.analyses == 2
+    assert voting_system.get_proposal_view(dao)['tallies'] == {'1': {'for': 5, 'against': 0, 'abstain': 0}}
+
+
+def test_only_the_lease_holder_warms():
+    redis_client, chain = FakeRedis(), LocalChain()
+    first_analyzer, second_analyzer = StubAnalyzer(), StubAnalyzer()
+    first, _, _ = make_warmer(redis_client, chain, first_analyzer)
+    second, _, _ = make_warmer(redis_client, chain, second_analyzer)
+
+    assert first.run_once()
+    chain.mine()
+    chain.for_votes = 1
+    assert not second.run_once()
+    assert second_analyzer.analyses == 0
+
+    first.release_lease()
+    assert second.run_once()
+    assert second_analyzer.analyses == 1
+    assert not first.acquire_lease()
+
+
+def test_lease_expires_when_holder_stops_renewing():
+    redis_client, chain = FakeRedis(), LocalChain()
+    first, _, _ = make_warmer(redis_client, chain, StubAnalyzer(), lease_ttl=0.05)
+    second, _, _ = make_warmer(redis_client, chain, StubAnalyzer(), lease_ttl=0.05)
+
+    assert first.acquire_lease()
+    assert not second.acquire_lease()
+    time.sleep(0.1)
+    assert second.acquire_lease()
+    assert not first.acquire_lease()
+
+
+def test_lease_is_kept_through_a_pass_longer_than_its_ttl():
+    redis_client, chain = FakeRedis(), LocalChain()
+    first, _, _ = make_warmer(redis_client, chain, StubAnalyzer(delay=0.3), lease_ttl=0.1)
+    second, _, _ = make_warmer(redis_client, chain, StubAnalyzer(), lease_ttl=0.1)
+
+    assert first.run_once()
+    assert first.holds_lease()
+    assert not second.acquire_lease()
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+import registry
+from registry import ContractRegistry
+from voting import VotingSystem
+from fake_redis import FakeRedis
+
+ABI_PATH = str(Path(__file__).resolve().parent.parent / "contract/compiled/contract_abi.json")
+
+
+def make_registry(tmp_path, redis_client=None):
+    config_path = tmp_path / "daos.json"
+    config_path.write_text(json.dumps([
+        {'id': 'alpha', 'name': 'Alpha', 'contract_address': '0x' + '11' * 20,
+         'provider_uri': 'http://localhost:8545', 'abi_path': ABI_PATH, 'rate_limit': 2},
+        {'id': 'beta', 'name': 'Beta', 'contract_address': '0x' + '22' * 20,
+         'provider_uri': 'http://localhost:8545', 'abi_path': ABI_PATH},
+    ]))
+    return ContractRegistry(redis_client or FakeRedis(), str(config_path))
+
+
+def test_daos_share_provider_and_abi(tmp_path):
+    contracts = make_registry(tmp_path)
+    alpha, beta = contracts.get('alpha'), contracts.get('beta')
+
+    assert alpha.contract.w3 is beta.contract.w3
+    assert alpha.contract.contract.abi == beta.contract.contract.abi
+    assert contracts.default() is None
+
+
+def test_dao_keys_are_namespaced(tmp_path):
+    contracts = make_registry(tmp_path)
+
+    assert contracts.get('alpha').key("votes:0xabc") == "dao:alpha:votes:0xabc"
+    assert contracts.get('beta').index._meta_key() == "dao:beta:proposals:index:meta"
+
+
+def test_default_dao_keeps_unprefixed_keys(monkeypatch):
+    monkeypatch.delenv("DAO_CONFIG_PATH", raising=False)
+    monkeypatch.setenv("INFURA_URL", "http://localhost:8545")
+    monkeypatch.setenv("CONTRACT_ADDRESS", '0x' + '33' * 20)
+    monkeypatch.chdir(Path(ABI_PATH).parent.parent.parent)
+    contracts = ContractRegistry(FakeRedis())
+
+    dao = contracts.default()
+    assert dao.dao_id == 'default'
+    assert dao.key("votes:0xabc") == "votes:0xabc"
+    assert dao.index._meta_key() == "proposals:index:meta"
+
+
+def test_rate_limit_counts_per_dao_and_resets_each_minute(tmp_path, monkeypatch):
+    redis_client = FakeRedis()
+    contracts = make_registry(tmp_path, redis_client)
+    alpha, beta = contracts.get('alpha'), contracts.get('beta')
+    monkeypatch.setattr(registry.time, 'time', lambda: 6000.0)
+
+    assert contracts.check_rate_limit(alpha)
+    assert contracts.check_rate_limit(alpha)
+    assert not contracts.check_rate_limit(alpha)
+    # No limit configured for beta, and alpha's count does not touch it
+    assert all(contracts.check_rate_limit(beta) for _ in range(5))
+
+    window_key = "dao:alpha:ratelimit:100"
+    assert redis_client.get(window_key) == b"3"
+    assert window_key in redis_client.expiry
+
+    monkeypatch.setattr(registry.time, 'time', lambda: 6060.0)
+    assert contracts.check_rate_limit(alpha)
+
+
+def test_sessions_select_a_dao_when_several_are_registered(tmp_path):
+    redis_client = FakeRedis()
+    voting_system = VotingSystem(redis_client, make_registry(tmp_path, redis_client))
+
+    assert voting_system.get_dao("session") is None
+    assert "6. Switch DAO" in voting_system.get_menu()
+    assert voting_system.select_dao("session", "3") == (False, "Invalid DAO choice.")
+    assert voting_system.select_dao("session", "0") == (False, "Invalid DAO choice.")
+
+    assert voting_system.select_dao("session", "2") == (True, "Selected DAO: Beta")
+    assert voting_system.get_dao("session").dao_id == 'beta'
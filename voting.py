@@ -1,28 +1,26 @@
-import os
+import json
+import hashlib
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from proposal_analysis import ProposalAnalyzer
-from blockchain import GovernorBravoContract, ProposalState
+from blockchain import ProposalState
+from registry import ContractRegistry, DAO
 from dotenv import load_dotenv
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class VotingSystem:
-    def __init__(self, redis_client):
+    def __init__(self, redis_client, registry: ContractRegistry):
         # Load environment variables
         load_dotenv()
         
         # Redis client for session management
         self.redis_client = redis_client
         
-        # Initialize the blockchain contract
-        self.governor_contract = GovernorBravoContract(
-            web3_provider_uri=os.getenv("INFURA_URL"),
-            abi_path="contract/compiled/contract_abi.json",
-            contract_address=os.getenv("CONTRACT_ADDRESS")
-        )
+        # Governor contracts served by this process
+        self.registry = registry
         
     
     def get_wallet_address(self, session_id: str) -> Optional[str]:
@@ -34,14 +32,8 @@ class VotingSystem:
     def set_wallet_address(self, session_id: str, wallet_address: str) -> bool:
         """Set wallet address in Redis session"""
         try:
+            # Vote counts are created by hincrby on the first vote and read with '0' defaults
             self.redis_client.set(f"wallet:{session_id}", wallet_address)
-            # Initialize vote counts for new users
-            if not self.redis_client.exists(f"votes:{wallet_address}"):
-                self.redis_client.hmset(f"votes:{wallet_address}", {
-                    'for': 0,
-                    'against': 0,
-                    'abstain': 0
-                })
             return True
         except Exception as e:
             logger.error(f"Error setting wallet address: {str(e)}")
@@ -62,29 +54,137 @@ class VotingSystem:
             logger.error(f"Error initializing user: {str(e)}")
             return False, f"Error initializing user: {str(e)}"
 
-    def display_proposals(self, session_id: str) -> str:
+    def get_dao(self, session_id: str) -> Optional[DAO]:
+        """Get the DAO selected in the session, or the only registered one"""
+        dao_id = self.redis_client.get(f"selected_dao:{session_id}")
+        if dao_id:
+            dao = self.registry.get(dao_id.decode('utf-8'))
+            if dao:
+                return dao
+        return self.registry.default()
+
+    def select_dao(self, session_id: str, choice: str) -> Tuple[bool, str]:
+        """Select a DAO for the session by its position in the DAO menu"""
+        daos = self.registry.all()
+        if not choice.isdigit() or not 1 <= int(choice) <= len(daos):
+            return False, "Invalid DAO choice."
+        dao = daos[int(choice) - 1]
+        self.redis_client.set(f"selected_dao:{session_id}", dao.dao_id)
+        return True, f"Selected DAO: {dao.name}"
+
+    def get_dao_menu(self) -> str:
+        """Return the DAO selection options"""
+        menu = ["\n=== Select a DAO ==="]
+        for position, dao in enumerate(self.registry.all(), start=1):
+            menu.append(f"{position}. {dao.name}")
+        menu.append(f"\nEnter your choice (1-{len(self.registry.daos)}): ")
+        return "\n".join(menu)
+
+    def _session_dao(self, session_id: str) -> Tuple[Optional[DAO], str]:
+        """Get the session's DAO and count the request against its rate limit"""
+        dao = self.get_dao(session_id)
+        if not dao:
+            return None, "No DAO selected. Please choose a DAO first."
+        if not self.registry.check_rate_limit(dao):
+            return None, f"Too many requests for {dao.name}. Please try again shortly."
+        return dao, ""
+
+    def build_proposal_view(self, dao: DAO, proposal_analyzer: ProposalAnalyzer,
+                            previous_fingerprint: Optional[str] = None,
+                            head: Optional[int] = None) -> Optional[Dict]:
+        """Compute the wallet-independent part of the proposal view.
+
+        Returns None when the proposal data matches previous_fingerprint, so the
+        LLM analysis is only re-run when something on chain has changed. head
+        is the chain head when the caller already knows it.
+        """
+        indexed_block = dao.index.refresh(head)
+        recent_proposals = proposal_analyzer.fetch_recent_proposals()
+        proposal_ids = dao.index.list_ids(page_size=max(1, dao.index.count()))
+
+        # Only Active proposals are listed, the only ones whose tallies still move
+        tallies = {}
+        for proposal_id in proposal_ids:
+            proposal_votes = dao.contract.get_proposal_votes(proposal_id)
+            if proposal_votes:
+                tallies[str(proposal_id)] = proposal_votes
+
+        fingerprint = hashlib.sha256(
+            json.dumps([recent_proposals, proposal_ids, tallies], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        if fingerprint == previous_fingerprint:
+            return None
+
+        return {
+            'block': indexed_block,
+            'fingerprint': fingerprint,
+            'analysis': proposal_analyzer.analyze_proposals(recent_proposals),
+            'proposal_ids': proposal_ids,
+            'tallies': tallies
+        }
+
+    def publish_proposal_view(self, dao: DAO, proposal_analyzer: ProposalAnalyzer,
+                              head: Optional[int] = None) -> bool:
+        """Recompute the shared proposal view and store it in Redis if it changed"""
+        view = self.get_proposal_view(dao)
+        new_view = self.build_proposal_view(dao, proposal_analyzer, view['fingerprint'] if view else None, head)
+        # Expire the view if the warmer stops, so requests fall back to computing it
+        if new_view is None:
+            self.redis_client.expire(dao.key("proposals:view"), 600)
+            return False
+        self.redis_client.set(dao.key("proposals:view"), json.dumps(new_view), ex=600)
+        logger.info(f"Published proposal view for DAO {dao.dao_id} at block {new_view['block']}")
+        return True
+
+    def get_proposal_view(self, dao: DAO) -> Optional[Dict]:
+        """Get the shared proposal view from Redis"""
+        view = self.redis_client.get(dao.key("proposals:view"))
+        return json.loads(view) if view else None
+
+    def display_proposals(self, session_id: str, page: int = 1) -> str:
         """Display analyzed proposals and their current status"""
         try:
             wallet_address = self.get_wallet_address(session_id)
             if not wallet_address:
                 return "No user initialized. Please set wallet address first."
+            
+            dao, message = self._session_dao(session_id)
+            if not dao:
+                return message
+            
+            # Use the view published by the warmer, computing it here only on a cold cache
+            view = self.get_proposal_view(dao)
+            if view is None:
+                self.publish_proposal_view(dao, ProposalAnalyzer(dao.contract))
+                view = self.get_proposal_view(dao)
                 
             output = []
-            output.append("=== Current Proposal Analysis ===")
-            
-            # Initialize proposal analyzer
-            proposal_analyzer = ProposalAnalyzer()
-            analysis = proposal_analyzer.analyze_proposals()
-            output.append(analysis)
+            output.append(f"=== Current Proposal Analysis: {dao.name} ===")
+            output.append(view['analysis'])
             
-            # Get proposal count
-            proposal_count = self.governor_contract.get_proposal_count()
-            latest_proposals = range(max(1, proposal_count - 10), proposal_count + 1)
+            # List votable proposals from the view
+            page_size = 10
+            proposal_ids = view['proposal_ids']
+            total_pages = max(1, -(-len(proposal_ids) // page_size))
+            page = min(max(page, 1), total_pages)
+            votable_proposals = proposal_ids[(page - 1) * page_size:page * page_size]
             output.append("\n=== Available Proposals ID for Voting ===\n")
-            output.append(str(list(latest_proposals)))
+            output.append(str(votable_proposals))
+            for proposal_id in votable_proposals:
+                tally = view['tallies'].get(str(proposal_id))
+                if tally:
+                    output.append(
+                        f"Proposal {proposal_id}: "
+                        f"For {tally['for']} | "
+                        f"Against {tally['against']} | "
+                        f"Abstain {tally['abstain']}"
+                    )
+            output.append(f"\nPage {page} of {total_pages}")
+            if total_pages > 1:
+                output.append("(Enter '1 <page>' to view another page)")
             
             # Get user's voting statistics - decode bytes to string
-            user_stats = self.redis_client.hgetall(f"votes:{wallet_address}")
+            user_stats = self.redis_client.hgetall(dao.key(f"votes:{wallet_address}"))
             output.append("\nCurrent Voting Statistics:\n")
             output.append(f"Total 'For' votes: {user_stats.get(b'for', b'0').decode('utf-8')}\n")
             output.append(f"Total 'Against' votes: {user_stats.get(b'against', b'0').decode('utf-8')}\n")
@@ -96,6 +196,18 @@ class VotingSystem:
             logger.error(f"Error displaying proposals: {str(e)}")
             return f"Error displaying proposals: {str(e)}"
 
+    def validate_proposal_id(self, session_id: str, proposal_id: int) -> Tuple[bool, str]:
+        """Check that a proposal exists and is open for voting using the index"""
+        try:
+            dao = self.get_dao(session_id)
+            if not dao:
+                return False, "No DAO selected"
+            return dao.index.validate_proposal_id(proposal_id)
+        except Exception as e:
+            # Fall back to the on-chain check in submit_vote
+            logger.error(f"Error validating proposal {proposal_id}: {str(e)}")
+            return True, ""
+
     def submit_vote(self, session_id: str, proposal_id: int, vote: str) -> str:
         """Submit a vote for a specific proposal"""
         try:
@@ -107,13 +219,17 @@ class VotingSystem:
             if vote not in ['for', 'against', 'abstain']:
                 return f"Invalid vote option: {vote}"
             
-            # Check if proposal exists and is Executed
-            proposal_details = self.governor_contract.get_proposal_details(proposal_id)
+            dao, message = self._session_dao(session_id)
+            if not dao:
+                return message
+            
+            # Check if proposal exists and is Active, as castVote requires
+            proposal_details = dao.contract.get_proposal_details(proposal_id)
             if not proposal_details:
                 return f"Proposal {proposal_id} not found"
             
-            if proposal_details['state'] != ProposalState.Executed.name:
-                return f"Proposal {proposal_id} is not Executed"
+            if proposal_details['state'] != ProposalState.Active.name:
+                return f"Proposal {proposal_id} is not Active"
             
             # Create vote data dictionary
             vote_data = {
@@ -123,11 +239,11 @@ class VotingSystem:
             }
             
             # Store vote data as a string representation
-            vote_key = f"proposal:{proposal_id}:votes"
+            vote_key = dao.key(f"proposal:{proposal_id}:votes")
             self.redis_client.hset(vote_key, wallet_address, str(vote_data))
-            self.redis_client.hincrby(f"votes:{wallet_address}", vote, 1)
+            self.redis_client.hincrby(dao.key(f"votes:{wallet_address}"), vote, 1)
             
-            log_message = f"Vote recorded - Proposal: {proposal_id}, Wallet: {wallet_address}, Vote: {vote}"
+            log_message = f"Vote recorded - DAO: {dao.dao_id}, Proposal: {proposal_id}, Wallet: {wallet_address}, Vote: {vote}"
             logger.info(log_message)
             
             return f"Vote successfully recorded!\n\n{log_message}"
@@ -143,10 +259,14 @@ class VotingSystem:
             if not wallet_address:
                 return "No user initialized. Please set wallet address first."
 
-            output = ["\n=== Your Voting History ==="]
+            dao, message = self._session_dao(session_id)
+            if not dao:
+                return message
+
+            output = [f"\n=== Your Voting History: {dao.name} ==="]
             
             # Get current vote counts
-            user_stats = self.redis_client.hgetall(f"votes:{wallet_address}")
+            user_stats = self.redis_client.hgetall(dao.key(f"votes:{wallet_address}"))
             vote_counts = {
                 'for': user_stats.get(b'for', b'0').decode('utf-8'),
                 'against': user_stats.get(b'against', b'0').decode('utf-8'),
@@ -154,9 +274,9 @@ class VotingSystem:
             }
             
             # Get all proposals
-            proposal_count = self.governor_contract.get_proposal_count()
+            proposal_count = dao.contract.get_proposal_count()
             for proposal_id in range(1, proposal_count + 1):
-                vote_key = f"proposal:{proposal_id}:votes"
+                vote_key = dao.key(f"proposal:{proposal_id}:votes")
                 vote_data = self.redis_client.hget(vote_key, wallet_address)
                 
                 if vote_data:
@@ -174,7 +294,7 @@ class VotingSystem:
                             vote = vote_info
                             timestamp = "Not recorded"
                         
-                        proposal_details = self.governor_contract.get_proposal_details(proposal_id)
+                        proposal_details = dao.contract.get_proposal_details(proposal_id)
                         
                         output.append(f"\nProposal ID: {proposal_id}")
                         output.append(f"Vote: {vote}")
@@ -205,7 +325,11 @@ class VotingSystem:
             "2. Submit Vote",
             "3. View All Voting History",
             "4. Switch Wallet",
-            "5. Exit",
-            "\nEnter your choice (1-5): "
+            "5. Exit"
         ]
+        if len(self.registry.daos) > 1:
+            menu.append("6. Switch DAO")
+            menu.append("\nEnter your choice (1-6): ")
+        else:
+            menu.append("\nEnter your choice (1-5): ")
         return "\n".join(menu)
\ No newline at end of file